@@ -9,6 +9,11 @@ import anthropic
 from modules.eda import run_eda
 from modules.etl import run_etl
 from modules.insights import run_insights
+from modules.categorical import CategoryIndex, build_category_index
+
+# Copy-on-write (por defecto desde pandas 3): el ETL comparte columnas sin copiar el dataset
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
 
 # ─── PAGE CONFIG ───────────────────────────────────────────────────────────────
 st.set_page_config(
@@ -150,6 +155,9 @@ with st.sidebar:
     drop_duplicates = st.checkbox("Eliminar duplicados", value=True)
     fill_nulls = st.selectbox("Manejo de nulos", ["Mediana/Moda", "Media", "Eliminar filas", "Dejar como están"])
     normalize = st.checkbox("Normalizar columnas numéricas", value=False)
+    memory_budget = st.number_input("Presupuesto de memoria ETL (MB, 0 = sin límite)",
+                                    min_value=0, value=0, step=256,
+                                    help="Si el pico estimado lo supera, el ETL se procesa por lotes (el pico real se mide)")
 
     st.markdown("---")
     run_btn = st.button("🚀 Analizar Dataset", use_container_width=True)
@@ -157,13 +165,21 @@ with st.sidebar:
 # ─── LOAD DATA ─────────────────────────────────────────────────────────────────
 df_raw = None
 df_clean = None
+cat_index_raw = None
 
 if uploaded_file:
     try:
-        if uploaded_file.name.endswith(".csv"):
-            df_raw = pd.read_csv(uploaded_file)
-        else:
-            df_raw = pd.read_excel(uploaded_file)
+        # El dataset y su índice categórico se construyen una sola vez por archivo subido
+        file_key = (uploaded_file.name, uploaded_file.size, getattr(uploaded_file, "file_id", None))
+        dataset = st.session_state.get("dataset")
+        if dataset is None or dataset["key"] != file_key:
+            if uploaded_file.name.endswith(".csv"):
+                df_loaded = pd.read_csv(uploaded_file)
+            else:
+                df_loaded = pd.read_excel(uploaded_file)
+            dataset = {"key": file_key, "df": df_loaded, "cat_index": CategoryIndex(df_loaded)}
+            st.session_state["dataset"] = dataset
+        df_raw, cat_index_raw = dataset["df"], dataset["cat_index"]
 
         # Update KPI selector with real columns
         with st.sidebar:
@@ -177,22 +193,25 @@ if df_raw is not None:
     tab1, tab2, tab3, tab4 = st.tabs(["📊 EDA", "🔧 ETL", "🤖 Insights IA", "📥 Exportar"])
 
     with tab1:
-        run_eda(df_raw)
+        run_eda(df_raw, cat_index=cat_index_raw)
 
     with tab2:
         df_clean = run_etl(df_raw, drop_duplicates=drop_duplicates,
-                           fill_strategy=fill_nulls, normalize=normalize)
+                           fill_strategy=fill_nulls, normalize=normalize,
+                           memory_budget_mb=memory_budget or None)
 
     with tab3:
         if not api_key:
             st.warning("⚠️ Ingresa tu Anthropic API Key en el sidebar para activar los Insights IA.")
         else:
             selected_kpi = kpi_col if "kpi_selector" in st.session_state else (df_raw.columns[0] if len(df_raw.columns) > 0 else None)
+            df_insights = df_clean if df_clean is not None else df_raw
             run_insights(
-                df=df_clean if df_clean is not None else df_raw,
+                df=df_insights,
                 kpi_col=selected_kpi,
                 context=kpi_context,
-                api_key=api_key
+                api_key=api_key,
+                cat_index=build_category_index(df_insights, cat_index_raw)
             )
 
     with tab4:
@@ -0,0 +1,91 @@
+import pandas as pd
+import numpy as np
+
+
+class CategoryIndex:
+    """Codificación de diccionario compartida para las columnas categóricas de un dataset.
+
+    Cada columna object/category se factoriza una sola vez en códigos enteros
+    (``-1`` = nulo) junto con su tabla de frecuencias. Los conteos, filtros
+    Top-N y agregaciones por categoría reutilizan esa misma codificación.
+    """
+
+    def __init__(self, df: pd.DataFrame):
+        self.df = df
+        self.columns = df.select_dtypes(include=["object", "category"]).columns.tolist()
+        self._encodings = {}
+
+    def _encode(self, col: str) -> dict:
+        enc = self._encodings.get(col)
+        if enc is None:
+            s = self.df[col]
+            if isinstance(s.dtype, pd.CategoricalDtype):
+                # Ya está codificada: se reutilizan sus códigos y el orden de sus categorías
+                codes, uniques = s.cat.codes.to_numpy(), s.cat.categories
+            else:
+                codes, uniques = pd.factorize(s, sort=False)
+            counts = np.bincount(codes[codes >= 0], minlength=len(uniques))
+            enc = {
+                "codes": codes,
+                "uniques": pd.Index(uniques),
+                "counts": counts,
+                # Códigos ordenados por frecuencia descendente (empates: orden de aparición)
+                "order": np.argsort(-counts, kind="stable"),
+            }
+            self._encodings[col] = enc
+        return enc
+
+    def codes(self, col: str) -> np.ndarray:
+        return self._encode(col)["codes"]
+
+    def top_codes(self, col: str, n: int | None = None) -> np.ndarray:
+        order = self._encode(col)["order"]
+        return order if n is None else order[:n]
+
+    def value_counts(self, col: str, n: int | None = None) -> pd.Series:
+        """Equivalente a ``df[col].value_counts().nlargest(n)`` sin volver a escanear la columna."""
+        enc = self._encode(col)
+        top = self.top_codes(col, n)
+        vc = pd.Series(enc["counts"][top], index=enc["uniques"][top], name="count")
+        vc.index.name = col
+        return vc
+
+    def top_mask(self, col: str, n: int) -> np.ndarray:
+        """Máscara booleana de filas cuya categoría está en el Top-N (equivale a ``isin(top_cats)``)."""
+        enc = self._encode(col)
+        # La última posición de la tabla corresponde al código -1 (nulos) y queda en False
+        keep = np.zeros(len(enc["uniques"]) + 1, dtype=bool)
+        keep[self.top_codes(col, n)] = True
+        return keep[enc["codes"]]
+
+    def group_agg(self, col: str, values: pd.Series, n: int | None = None) -> pd.DataFrame:
+        """Media, suma y conteo de ``values`` por categoría mediante ``np.bincount``.
+
+        Replica ``groupby(col)[values].agg(["mean", "sum", "count"])`` restringido
+        al Top-N de categorías por frecuencia; los nulos de ``values`` se ignoran.
+        """
+        enc = self._encode(col)
+        codes = enc["codes"]
+        vals = values.to_numpy(dtype="float64", na_value=np.nan)
+        valid = (codes >= 0) & ~np.isnan(vals)
+        k = len(enc["uniques"])
+
+        count = np.bincount(codes[valid], minlength=k)
+        total = np.bincount(codes[valid], weights=vals[valid], minlength=k)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = total / count
+
+        top = self.top_codes(col, n)
+        return pd.DataFrame({
+            col: enc["uniques"][top],
+            "mean": mean[top],
+            "sum": total[top],
+            "count": count[top],
+        })
+
+
+def build_category_index(df: pd.DataFrame, cat_index: CategoryIndex | None = None) -> CategoryIndex:
+    """Reutiliza ``cat_index`` si pertenece a ``df``; en otro caso crea uno nuevo."""
+    if cat_index is not None and cat_index.df is df:
+        return cat_index
+    return CategoryIndex(df)
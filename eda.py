@@ -4,6 +4,8 @@ import numpy as np
 import plotly.express as px
 import plotly.graph_objects as go
 from plotly.subplots import make_subplots
+from modules.categorical import CategoryIndex, build_category_index
+from modules.outliers import detect_outliers
 
 PLOTLY_THEME = dict(
     template="plotly_dark",
@@ -14,16 +16,76 @@ PLOTLY_THEME = dict(
 
 COLOR_SEQ = px.colors.qualitative.Bold
 
+# Por encima de este número de columnas se activa el explorador paginado
+WIDE_COLUMNS_THRESHOLD = 200
+EXPLORER_PAGE_SIZE = 50
 
-def run_eda(df: pd.DataFrame):
+
+def _cached(df: pd.DataFrame, name: str, key, compute):
+    """Memoiza ``compute()`` en la sesión mientras el dataset (mismo objeto) y ``key`` no cambien.
+
+    El dataset se conserva entre reruns (ver ``app.py``), así que basta con comparar identidad.
+    """
+    entry = st.session_state.get(f"eda_cache_{name}")
+    if entry is None or entry["df"] is not df or entry["key"] != key:
+        entry = {"df": df, "key": key, "value": compute()}
+        st.session_state[f"eda_cache_{name}"] = entry
+    return entry["value"]
+
+
+def _column_metadata(df: pd.DataFrame) -> pd.DataFrame:
+    """Índice ligero de metadatos por columna (sin cálculos costosos como ``nunique``)."""
+    nulls = df.isnull().sum().to_numpy()
+    return pd.DataFrame({
+        "Columna": df.columns,
+        "Tipo": df.dtypes.astype(str).to_numpy(),
+        "Nulos": nulls,
+        "% Nulos": (nulls / max(len(df), 1) * 100).round(2),
+    })
+
+
+def _render_column_explorer(df: pd.DataFrame, meta: pd.DataFrame) -> list:
+    """Explorador paginado: filtra sobre ``meta`` y calcula/estiliza solo la página visible."""
+    c1, c2, c3 = st.columns([2, 2, 1])
+    query = c1.text_input("🔎 Buscar columna", key="explorer_query")
+    types = c2.multiselect("Filtrar por tipo", sorted(meta["Tipo"].unique()), key="explorer_types")
+
+    mask = np.ones(len(meta), dtype=bool)
+    if query:
+        mask &= meta["Columna"].astype(str).str.contains(query, case=False, regex=False).to_numpy()
+    if types:
+        mask &= meta["Tipo"].isin(types).to_numpy()
+    filtered = meta[mask]
+
+    n_pages = max(1, -(-len(filtered) // EXPLORER_PAGE_SIZE))
+    if st.session_state.get("explorer_page", 1) > n_pages:
+        st.session_state["explorer_page"] = 1
+    page = c3.number_input("Página", min_value=1, max_value=n_pages, key="explorer_page")
+    start = (int(page) - 1) * EXPLORER_PAGE_SIZE
+    page_meta = filtered.iloc[start:start + EXPLORER_PAGE_SIZE].copy()
+    page_cols = page_meta["Columna"].tolist()
+    page_meta["Únicos"] = df[page_cols].nunique().to_numpy()
+
+    st.caption(f"Mostrando {start + 1 if page_cols else 0}–{start + len(page_cols)} "
+               f"de {len(filtered):,} columnas filtradas ({len(meta):,} en total) · página {page}/{n_pages}")
+    st.dataframe(
+        page_meta.style.background_gradient(subset=["% Nulos"], cmap="RdYlGn_r"),
+        use_container_width=True, height=250
+    )
+    return page_cols
+
+
+def run_eda(df: pd.DataFrame, cat_index: CategoryIndex | None = None):
     st.markdown('<p class="section-title">📊 Análisis Exploratorio de Datos</p>', unsafe_allow_html=True)
 
     # ── Overview metrics
     col1, col2, col3, col4 = st.columns(4)
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
-    null_pct = (df.isnull().sum().sum() / (df.shape[0] * df.shape[1]) * 100)
-    dup_count = df.duplicated().sum()
+    cat_index = build_category_index(df, cat_index)
+    cat_cols = cat_index.columns
+    meta = _cached(df, "meta", None, lambda: _column_metadata(df))
+    null_pct = (meta["Nulos"].sum() / max(df.shape[0] * df.shape[1], 1) * 100)
+    dup_count = _cached(df, "duplicates", None, lambda: int(df.duplicated().sum()))
 
     metrics = [
         ("🗃️ Filas", f"{len(df):,}"),
@@ -42,22 +104,26 @@ def run_eda(df: pd.DataFrame):
 
     # ── Data types overview
     st.markdown("#### 🗂️ Tipos de Datos")
-    dtype_df = pd.DataFrame({
-        "Columna": df.columns,
-        "Tipo": df.dtypes.astype(str),
-        "Nulos": df.isnull().sum().values,
-        "% Nulos": (df.isnull().sum().values / len(df) * 100).round(2),
-        "Únicos": df.nunique().values,
-    })
-    st.dataframe(
-        dtype_df.style.background_gradient(subset=["% Nulos"], cmap="RdYlGn_r"),
-        use_container_width=True, height=250
-    )
+    if len(df.columns) > WIDE_COLUMNS_THRESHOLD:
+        st.info(f"🧭 Modo dataset ancho ({len(df.columns):,} columnas): los detalles, gráficos y "
+                "estadísticas se calculan solo para las columnas de la página visible.")
+        page_cols = _render_column_explorer(df, meta)
+        visible = set(page_cols)
+        numeric_cols = [c for c in numeric_cols if c in visible]
+        cat_cols = [c for c in cat_cols if c in visible]
+        meta = meta[meta["Columna"].isin(visible)]
+    else:
+        page_cols = df.columns.tolist()
+        dtype_df = meta.assign(Únicos=df.nunique().to_numpy())
+        st.dataframe(
+            dtype_df.style.background_gradient(subset=["% Nulos"], cmap="RdYlGn_r"),
+            use_container_width=True, height=250
+        )
 
     # ── Null heatmap
-    if df.isnull().any().any():
+    if meta["Nulos"].any():
         st.markdown("#### 🕳️ Mapa de Nulos")
-        null_matrix = df.isnull().astype(int)
+        null_matrix = df[page_cols].isnull().astype(int)
         fig_null = px.imshow(
             null_matrix.T,
             color_continuous_scale=["#12121A", "#6C63FF"],
@@ -115,9 +181,37 @@ def run_eda(df: pd.DataFrame):
         st.dataframe(df[numeric_cols].describe().T.style.background_gradient(cmap="Blues"),
                      use_container_width=True)
 
+        # Outliers (todas las columnas)
+        st.markdown("#### 🚨 Detección de Outliers")
+        o1, o2, o3 = st.columns(3)
+        iqr_k = o1.slider("Factor IQR (k)", 1.0, 3.0, 1.5, 0.5)
+        z_thresh = o2.slider("Umbral z robusto (MAD)", 2.0, 6.0, 3.5, 0.5)
+        baseline = o3.selectbox("Línea base", ["Global"] + cat_cols)
+        group_col = None if baseline == "Global" else baseline
+        outliers = _cached(
+            df, "outliers", (tuple(numeric_cols), group_col, iqr_k, z_thresh),
+            lambda: detect_outliers(df, numeric_cols, group_col=group_col, cat_index=cat_index,
+                                    iqr_k=iqr_k, z_thresh=z_thresh),
+        )
+        row_counts = outliers["row_counts"]
+        flagged_rows = int((row_counts > 0).sum())
+        st.caption(f"Filas con al menos una anomalía: {flagged_rows:,} "
+                   f"({flagged_rows / max(len(df), 1) * 100:.1f}%)")
+        st.dataframe(outliers["summary"].style.background_gradient(subset=["% Outliers"], cmap="Reds"),
+                     use_container_width=True, height=250)
+        if flagged_rows:
+            counts = row_counts.to_numpy()
+            top_pos = np.argsort(-counts, kind="stable")[:min(20, flagged_rows)]
+            st.markdown("**Filas más anómalas**")
+            st.dataframe(df.iloc[top_pos][numeric_cols].assign(Anomalías=counts[top_pos]),
+                         use_container_width=True, height=250)
+
         # Boxplots
         st.markdown("#### 📦 Boxplots (detección de outliers)")
-        selected_box = st.selectbox("Variable para boxplot", numeric_cols)
+        # La columna con más outliers solo es el valor inicial; luego manda la elección del usuario
+        if st.session_state.get("box_col") not in numeric_cols:
+            st.session_state["box_col"] = outliers["summary"]["Columna"].iloc[0]
+        selected_box = st.selectbox("Variable para boxplot", numeric_cols, key="box_col")
         group_options = ["Sin agrupación"] + cat_cols
         group_by = st.selectbox("Agrupar por", group_options)
 
@@ -125,8 +219,7 @@ def run_eda(df: pd.DataFrame):
             fig_box = px.box(df, y=selected_box, title=f"Boxplot: {selected_box}",
                              color_discrete_sequence=COLOR_SEQ, **PLOTLY_THEME)
         else:
-            top_cats = df[group_by].value_counts().nlargest(10).index
-            df_filtered = df[df[group_by].isin(top_cats)]
+            df_filtered = df[cat_index.top_mask(group_by, 10)]
             fig_box = px.box(df_filtered, x=group_by, y=selected_box,
                              title=f"Boxplot: {selected_box} por {group_by}",
                              color=group_by, color_discrete_sequence=COLOR_SEQ, **PLOTLY_THEME)
@@ -139,7 +232,7 @@ def run_eda(df: pd.DataFrame):
         selected_cat = st.selectbox("Variable categórica", cat_cols)
         top_n = st.slider("Top N categorías", 5, 30, 10)
 
-        vc = df[selected_cat].value_counts().nlargest(top_n).reset_index()
+        vc = cat_index.value_counts(selected_cat, top_n).reset_index()
         vc.columns = [selected_cat, "count"]
 
         fig_bar = px.bar(
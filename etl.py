@@ -1,7 +1,6 @@
 import streamlit as st
 import pandas as pd
-import numpy as np
-from sklearn.preprocessing import MinMaxScaler
+from modules.transform import EtlTransform
 
 PLOTLY_THEME = dict(
     template="plotly_dark",
@@ -13,19 +12,22 @@ PLOTLY_THEME = dict(
 
 def run_etl(df: pd.DataFrame, drop_duplicates: bool = True,
             fill_strategy: str = "Mediana/Moda",
-            normalize: bool = False) -> pd.DataFrame:
+            normalize: bool = False,
+            memory_budget_mb: float | None = None) -> pd.DataFrame:
 
     st.markdown('<p class="section-title">🔧 Pipeline ETL – Limpieza y Transformación</p>',
                 unsafe_allow_html=True)
 
-    df_clean = df.copy()
+    transform = EtlTransform(drop_duplicates=drop_duplicates, fill_strategy=fill_strategy,
+                             normalize=normalize, memory_budget_mb=memory_budget_mb)
+    df_clean = transform.fit_transform(df)
+    stats = transform.stats
     log = []
 
     # ── 1. Duplicados
     st.markdown("#### 1️⃣ Manejo de Duplicados")
-    dup_before = df_clean.duplicated().sum()
+    dup_before = stats["duplicates"]
     if drop_duplicates and dup_before > 0:
-        df_clean = df_clean.drop_duplicates()
         log.append(f"🗑️ Eliminadas **{dup_before}** filas duplicadas")
         st.success(f"Eliminadas {dup_before} filas duplicadas")
     elif dup_before == 0:
@@ -35,8 +37,8 @@ def run_etl(df: pd.DataFrame, drop_duplicates: bool = True,
 
     # ── 2. Nulos
     st.markdown("#### 2️⃣ Imputación de Nulos")
-    null_counts = df_clean.isnull().sum()
-    null_cols = null_counts[null_counts > 0]
+    null_cols = stats["null_counts"]
+    rows_before_na = len(df_clean) + stats["rows_dropped_na"]
 
     if len(null_cols) == 0:
         st.success("✅ No hay valores nulos")
@@ -44,36 +46,19 @@ def run_etl(df: pd.DataFrame, drop_duplicates: bool = True,
         st.dataframe(pd.DataFrame({
             "Columna": null_cols.index,
             "Nulos": null_cols.values,
-            "% Nulos": (null_cols.values / len(df_clean) * 100).round(2)
+            "% Nulos": (null_cols.values / rows_before_na * 100).round(2)
         }), use_container_width=True)
 
-        numeric_cols = df_clean.select_dtypes(include=np.number).columns
-        cat_cols = df_clean.select_dtypes(include=["object", "category"]).columns
-
         if fill_strategy == "Mediana/Moda":
-            for c in numeric_cols:
-                if df_clean[c].isnull().any():
-                    df_clean[c].fillna(df_clean[c].median(), inplace=True)
-            for c in cat_cols:
-                if df_clean[c].isnull().any():
-                    df_clean[c].fillna(df_clean[c].mode()[0] if len(df_clean[c].mode()) > 0 else "Unknown", inplace=True)
             log.append("🔧 Nulos imputados con **Mediana/Moda**")
             st.success("Nulos imputados con Mediana (numéricos) y Moda (categóricos)")
 
         elif fill_strategy == "Media":
-            for c in numeric_cols:
-                if df_clean[c].isnull().any():
-                    df_clean[c].fillna(df_clean[c].mean(), inplace=True)
-            for c in cat_cols:
-                if df_clean[c].isnull().any():
-                    df_clean[c].fillna("Unknown", inplace=True)
             log.append("🔧 Nulos imputados con **Media**")
             st.success("Nulos imputados con Media (numéricos)")
 
         elif fill_strategy == "Eliminar filas":
-            before = len(df_clean)
-            df_clean = df_clean.dropna()
-            removed = before - len(df_clean)
+            removed = stats["rows_dropped_na"]
             log.append(f"🗑️ Eliminadas **{removed}** filas con nulos")
             st.warning(f"Eliminadas {removed} filas con al menos un nulo")
 
@@ -82,42 +67,28 @@ def run_etl(df: pd.DataFrame, drop_duplicates: bool = True,
 
     # ── 3. Tipos de datos
     st.markdown("#### 3️⃣ Inferencia de Tipos")
-    date_candidates = [c for c in df_clean.select_dtypes("object").columns
-                       if any(kw in c.lower() for kw in ["date", "fecha", "time", "dia", "mes", "año"])]
-    converted = []
-    for c in date_candidates:
-        try:
-            df_clean[c] = pd.to_datetime(df_clean[c], infer_datetime_format=True, errors="coerce")
-            converted.append(c)
-        except Exception:
-            pass
+    converted = stats["dates_converted"]
     if converted:
-        st.success(f"📅 Columnas convertidas a fecha: {', '.join(converted)}")
+        formats = ", ".join(f"{c} ({transform.date_formats[c] or 'auto'})" for c in converted)
+        st.success(f"📅 Columnas convertidas a fecha: {formats}")
         log.append(f"📅 Fechas detectadas y convertidas: {converted}")
     else:
         st.info("ℹ️ No se detectaron columnas de fecha por nombre")
 
     # ── 4. Normalización
     st.markdown("#### 4️⃣ Normalización")
-    numeric_cols = df_clean.select_dtypes(include=np.number).columns.tolist()
-    if normalize and len(numeric_cols) > 0:
-        scaler = MinMaxScaler()
-        df_clean[numeric_cols] = scaler.fit_transform(df_clean[numeric_cols])
+    numeric_cols = list(transform.scaler_min)
+    if numeric_cols:
         log.append(f"📐 Variables numéricas normalizadas (MinMax): {numeric_cols}")
         st.success(f"Variables normalizadas (0-1): {', '.join(numeric_cols)}")
     else:
         st.info("ℹ️ Normalización desactivada")
 
     # ── 5. Columnas derivadas de fecha
-    date_cols = df_clean.select_dtypes(include=["datetime64"]).columns.tolist()
+    date_cols = list(dict.fromkeys(d["source"] for d in transform.derived))
     if date_cols:
         st.markdown("#### 5️⃣ Features de Fecha Derivadas")
-        for dc in date_cols:
-            df_clean[f"{dc}_year"] = df_clean[dc].dt.year
-            df_clean[f"{dc}_month"] = df_clean[dc].dt.month
-            df_clean[f"{dc}_day"] = df_clean[dc].dt.day
-            df_clean[f"{dc}_weekday"] = df_clean[dc].dt.day_name()
-        st.success(f"✅ Derivadas: año, mes, día, día semana para {date_cols}")
+        st.success(f"✅ Derivadas: año (Int16), mes y día (Int8), día semana (categórica) para {date_cols}")
         log.append("📅 Features de fecha extraídas automáticamente")
 
     # ── Log summary
@@ -128,11 +99,54 @@ def run_etl(df: pd.DataFrame, drop_duplicates: bool = True,
     else:
         st.info("No se realizaron transformaciones")
 
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns(3)
     col1.metric("Filas originales", f"{len(df):,}")
     col2.metric("Filas resultantes", f"{len(df_clean):,}", delta=f"{len(df_clean)-len(df):,}")
+    if stats["peak_mb"] is not None:
+        col3.metric("Memoria pico (medida)", f"{stats['peak_mb']:,.1f} MB",
+                    help=f"Medida con tracemalloc. Estimación previa: {stats['peak_mb_estimate']:,.1f} MB. "
+                         f"Modo: {stats['mode']}")
+    else:
+        col3.metric("Memoria pico (estimada)", f"{stats['peak_mb_estimate']:,.1f} MB",
+                    help=f"Estimación heurística, no medida (se mide al fijar un presupuesto). "
+                         f"Modo: {stats['mode']}")
+    if not stats["within_budget"]:
+        st.warning(f"⚠️ El pico medido ({stats['peak_mb']:,.1f} MB) supera el presupuesto de "
+                   f"{memory_budget_mb:,g} MB (modo: {stats['mode']})")
 
     st.markdown("#### 👀 Preview del Dataset Limpio")
     st.dataframe(df_clean.head(30), use_container_width=True)
 
+    _render_transform_reuse(transform)
+
     return df_clean
+
+
+def _render_transform_reuse(transform: EtlTransform):
+    st.markdown("#### 💾 Transformación Reutilizable")
+    st.download_button("⬇️ Descargar transformación (JSON)", transform.to_json().encode(),
+                       "etl_transform.json", "application/json", use_container_width=True)
+
+    with st.expander("🔁 Aplicar una transformación a un nuevo archivo (sin reajustar)"):
+        saved = st.file_uploader("Transformación guardada (opcional, por defecto la actual)",
+                                 type=["json"], key="etl_transform_file")
+        new_file = st.file_uploader("Nuevo lote de datos", type=["csv", "xlsx", "xls"],
+                                    key="etl_new_batch")
+        chunksize = st.number_input("Filas por lote", min_value=1_000, value=50_000, step=10_000)
+
+        if new_file and st.button("⚙️ Aplicar transformación", use_container_width=True):
+            try:
+                fitted = EtlTransform.from_json(saved.getvalue().decode()) if saved else transform
+                with st.spinner("Transformando por lotes..."):
+                    result = fitted.transform_file(new_file, chunksize=int(chunksize))
+            except Exception as e:
+                st.error(f"Error al aplicar la transformación: {e}")
+                return
+
+            c1, c2, c3 = st.columns(3)
+            c1.metric("Filas leídas", f"{result['rows_in']:,}")
+            c2.metric("Filas resultantes", f"{result['rows_out']:,}")
+            c3.metric("Throughput", f"{result['rows_per_sec']:,.0f} filas/s")
+            st.download_button("⬇️ Descargar lote transformado (CSV)",
+                               result["output"].getvalue().encode(),
+                               "lote_transformado.csv", "text/csv", use_container_width=True)
@@ -5,6 +5,8 @@ import plotly.express as px
 import plotly.graph_objects as go
 import anthropic
 import json
+from modules.categorical import CategoryIndex, build_category_index
+from modules.outliers import detect_outliers, anomaly_digest
 
 PLOTLY_THEME = dict(
     template="plotly_dark",
@@ -15,15 +17,16 @@ PLOTLY_THEME = dict(
 COLOR_SEQ = px.colors.qualitative.Bold
 
 
-def _build_dataset_summary(df: pd.DataFrame, kpi_col: str) -> str:
+def _build_dataset_summary(df: pd.DataFrame, kpi_col: str, cat_index: CategoryIndex | None = None) -> str:
     numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
-    cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+    cat_index = build_category_index(df, cat_index)
+    cat_cols = cat_index.columns
 
     summary = {
         "shape": {"rows": len(df), "columns": len(df.columns)},
         "columns": df.columns.tolist(),
         "numeric_stats": df[numeric_cols].describe().round(4).to_dict() if numeric_cols else {},
-        "categorical_top": {c: df[c].value_counts().nlargest(5).to_dict() for c in cat_cols[:5]},
+        "categorical_top": {c: cat_index.value_counts(c, 5).to_dict() for c in cat_cols[:5]},
         "null_counts": df.isnull().sum().to_dict(),
         "kpi_column": kpi_col,
         "kpi_stats": df[kpi_col].describe().round(4).to_dict() if kpi_col and kpi_col in df.columns and pd.api.types.is_numeric_dtype(df[kpi_col]) else "No numérico",
@@ -32,13 +35,29 @@ def _build_dataset_summary(df: pd.DataFrame, kpi_col: str) -> str:
     return json.dumps(summary, ensure_ascii=False, default=str)
 
 
-def run_insights(df: pd.DataFrame, kpi_col: str, context: str, api_key: str):
+def _build_anomaly_summary(df: pd.DataFrame, kpi_col: str, cat_index: CategoryIndex | None = None,
+                           group_col: str | None = None) -> str:
+    numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+    if not numeric_cols:
+        return "{}"
+    result = detect_outliers(df, numeric_cols, group_col=group_col, cat_index=cat_index)
+    digest = anomaly_digest(result)
+    kpi_row = result["summary"][result["summary"]["Columna"] == kpi_col]
+    if len(kpi_row):
+        digest["kpi"] = kpi_row.round(4).to_dict(orient="records")[0]
+    return json.dumps(digest, ensure_ascii=False, default=str)
+
+
+def run_insights(df: pd.DataFrame, kpi_col: str, context: str, api_key: str,
+                 cat_index: CategoryIndex | None = None):
     st.markdown('<p class="section-title">🤖 Insights de Negocio con IA</p>', unsafe_allow_html=True)
 
     if not kpi_col:
         st.warning("⚠️ Selecciona el KPI principal en el sidebar.")
         return
 
+    cat_index = build_category_index(df, cat_index)
+
     # ── KPI Dashboard
     st.markdown("#### 🎯 Dashboard del KPI")
     if kpi_col in df.columns and pd.api.types.is_numeric_dtype(df[kpi_col]):
@@ -75,12 +94,11 @@ def run_insights(df: pd.DataFrame, kpi_col: str, context: str, api_key: str):
                 st.plotly_chart(fig_corr, use_container_width=True)
 
         # KPI by category
-        cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+        cat_cols = cat_index.columns
         if cat_cols:
             st.markdown("#### 📊 KPI por Categoría")
             sel_cat = st.selectbox("Analizar KPI por", cat_cols, key="kpi_cat")
-            top_cats = df[sel_cat].value_counts().nlargest(15).index
-            df_agg = df[df[sel_cat].isin(top_cats)].groupby(sel_cat)[kpi_col].agg(["mean", "sum", "count"]).reset_index()
+            df_agg = cat_index.group_agg(sel_cat, df[kpi_col], 15)
             df_agg.columns = [sel_cat, "Media", "Total", "Registros"]
 
             agg_metric = st.radio("Métrica", ["Media", "Total", "Registros"], horizontal=True)
@@ -114,7 +132,10 @@ def run_insights(df: pd.DataFrame, kpi_col: str, context: str, api_key: str):
             st.warning("Selecciona al menos un tipo de análisis")
             return
 
-        dataset_summary = _build_dataset_summary(df, kpi_col)
+        dataset_summary = _build_dataset_summary(df, kpi_col, cat_index)
+        # Línea base por la categoría elegida en "KPI por Categoría", si existe
+        anomaly_summary = (_build_anomaly_summary(df, kpi_col, cat_index, st.session_state.get("kpi_cat"))
+                           if "riesgos" in [prompt_options[p] for p in selected_prompts] else "{}")
 
         prompt_map = {
             "completo": f"""Eres un analista de datos senior. Analiza este dataset y proporciona:
@@ -144,7 +165,8 @@ Datos: {dataset_summary}""",
 3. Segmentos problemáticos
 4. Alertas tempranas recomendadas
 
-Datos: {dataset_summary}""",
+Datos: {dataset_summary}
+Outliers detectados (IQR + z robusto sobre todas las columnas numéricas): {anomaly_summary}""",
 
             "acciones": f"""Como director de estrategia, proporciona un plan de acción para mejorar '{kpi_col}':
 1. Priorización de acciones (Alta/Media/Baja urgencia)
@@ -198,7 +220,7 @@ Datos: {dataset_summary}""",
             st.warning("Escribe una pregunta primero")
             return
 
-        dataset_summary = _build_dataset_summary(df, kpi_col)
+        dataset_summary = _build_dataset_summary(df, kpi_col, cat_index)
         full_prompt = f"""Eres un analista de datos experto. El usuario tiene este dataset:
 {dataset_summary}
 
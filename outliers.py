@@ -0,0 +1,153 @@
+import pandas as pd
+import numpy as np
+from modules.categorical import CategoryIndex, build_category_index
+
+# Constante que hace al MAD comparable con la desviación estándar en datos normales
+MAD_SCALE = 0.6745
+
+
+def _baselines(block: np.ndarray, groups: np.ndarray, n_groups: int) -> np.ndarray:
+    """Q1, mediana, Q3 y MAD por grupo para un bloque de columnas.
+
+    Devuelve un arreglo ``(4, n_groups + 1, n_cols)``; la última fila es la línea base global.
+    """
+    out = np.full((4, n_groups + 1, block.shape[1]), np.nan)
+    with np.errstate(all="ignore"):
+        for g in range(n_groups + 1):
+            sub = block if g == n_groups else block[groups == g]
+            if len(sub) == 0 or np.isnan(sub).all():
+                continue
+            q1, med, q3 = np.nanquantile(sub, [0.25, 0.5, 0.75], axis=0)
+            out[:, g] = q1, med, q3, np.nanmedian(np.abs(sub - med), axis=0)
+    # Grupos sin datos suficientes en una columna heredan la línea base global
+    return np.where(np.isnan(out), out[:, -1:], out)
+
+
+def detect_outliers(df: pd.DataFrame, columns: list | None = None, group_col: str | None = None,
+                    cat_index: CategoryIndex | None = None, iqr_k: float = 1.5,
+                    z_thresh: float = 3.5, top_groups: int = 15,
+                    chunk_cells: int = 5_000_000) -> dict:
+    """Detecta outliers en todas las columnas numéricas a la vez con NumPy.
+
+    Combina límites IQR (``Q1 - k·IQR``, ``Q3 + k·IQR``) y z-score robusto
+    (``0.6745·(x - mediana) / MAD``). Con ``group_col`` cada fila se compara
+    con la línea base de su categoría (Top-N por frecuencia; el resto usa la global).
+    El cálculo se hace por bloques de ``chunk_cells`` celdas para acotar la memoria.
+
+    Devuelve ``summary`` (una fila por columna), ``row_counts`` (anomalías por fila)
+    y la configuración usada.
+    """
+    if columns is None:
+        columns = df.select_dtypes(include=np.number).columns.tolist()
+    n, p = len(df), len(columns)
+
+    groups, n_groups, group_labels = np.zeros(n, dtype=np.intp), 0, []
+    if group_col is not None:
+        cat_index = build_category_index(df, cat_index)
+        top = cat_index.top_codes(group_col, top_groups)
+        n_groups = len(top)
+        group_labels = cat_index.value_counts(group_col, top_groups).index.tolist()
+        # Código de categoría -> posición en el Top-N; nulos y resto -> línea base global
+        lookup = np.full(len(cat_index.top_codes(group_col)) + 1, n_groups, dtype=np.intp)
+        lookup[top] = np.arange(n_groups)
+        groups = lookup[cat_index.codes(group_col)]
+
+    # ── Líneas base por bloques de columnas
+    stats = np.full((4, n_groups + 1, p), np.nan)
+    col_block = max(1, chunk_cells // max(n, 1))
+    for j in range(0, p, col_block):
+        cols = columns[j:j + col_block]
+        block = df[cols].to_numpy(dtype="float64", na_value=np.nan)
+        stats[:, :, j:j + len(cols)] = _baselines(block, groups, n_groups)
+    q1, med, q3, mad = stats
+    iqr = q3 - q1
+    lower, upper = q1 - iqr_k * iqr, q3 + iqr_k * iqr
+
+    # ── Marcado por bloques de filas
+    row_counts = np.zeros(n, dtype=np.int32)
+    n_iqr = np.zeros(p, dtype=np.int64)
+    n_z = np.zeros(p, dtype=np.int64)
+    n_any = np.zeros(p, dtype=np.int64)
+    n_valid = np.zeros(p, dtype=np.int64)
+    row_block = max(1, chunk_cells // max(p, 1))
+    positions = df.columns.get_indexer(columns)
+    with np.errstate(all="ignore"):
+        for i in range(0, n, row_block):
+            x = df.iloc[i:i + row_block, positions].to_numpy(dtype="float64", na_value=np.nan)
+            g = groups[i:i + row_block]
+            iqr_flag = (x < lower[g]) | (x > upper[g])
+            z = MAD_SCALE * (x - med[g]) / mad[g]
+            z_flag = np.abs(z) > z_thresh
+            z_flag &= mad[g] > 0
+            flag = iqr_flag | z_flag
+            n_iqr += iqr_flag.sum(axis=0)
+            n_z += z_flag.sum(axis=0)
+            n_any += flag.sum(axis=0)
+            n_valid += (~np.isnan(x)).sum(axis=0)
+            row_counts[i:i + row_block] = flag.sum(axis=1)
+
+    summary = pd.DataFrame({
+        "Columna": columns,
+        "Q1": q1[-1],
+        "Mediana": med[-1],
+        "Q3": q3[-1],
+        "Límite inf.": lower[-1],
+        "Límite sup.": upper[-1],
+        "MAD": mad[-1],
+        "Outliers IQR": n_iqr,
+        "Outliers Z": n_z,
+        "Outliers": n_any,
+        "% Outliers": (n_any / np.maximum(n_valid, 1) * 100).round(2),
+    }).sort_values("% Outliers", ascending=False, kind="stable").reset_index(drop=True)
+
+    # Límites por categoría realmente usados (el resto de filas usa la línea base global)
+    group_fences = pd.DataFrame({
+        "Categoría": np.repeat(group_labels, p),
+        "Columna": np.tile(columns, n_groups),
+        "Límite inf.": lower[:-1].ravel(),
+        "Límite sup.": upper[:-1].ravel(),
+        "Mediana": med[:-1].ravel(),
+        "MAD": mad[:-1].ravel(),
+    })
+
+    return {
+        "summary": summary,
+        "group_fences": group_fences,
+        "row_counts": pd.Series(row_counts, index=df.index, name="Anomalías"),
+        "group_col": group_col,
+        "iqr_k": iqr_k,
+        "z_thresh": z_thresh,
+    }
+
+
+def anomaly_digest(result: dict, top: int = 10) -> dict:
+    """Resumen compacto (serializable) de ``detect_outliers`` para incluir en prompts."""
+    summary = result["summary"]
+    row_counts = result["row_counts"]
+    flagged = summary[summary["Outliers"] > 0].head(top)
+    columns = flagged[["Columna", "Límite inf.", "Límite sup.", "Mediana", "MAD", "Outliers", "% Outliers"]]
+    digest = {
+        "method": f"IQR k={result['iqr_k']} + z robusto (MAD) > {result['z_thresh']}",
+        "baseline": (f"por categoría '{result['group_col']}' (categorías fuera del Top-N y nulos: global)"
+                     if result["group_col"] else "global"),
+        "rows_with_anomalies": int((row_counts > 0).sum()),
+        "rows_total": int(len(row_counts)),
+        "most_anomalous_rows": {str(k): int(v) for k, v in row_counts[row_counts > 0].nlargest(5).items()},
+    }
+    if not result["group_col"]:
+        digest["columns"] = columns.round(4).to_dict(orient="records")
+        return digest
+
+    # Con línea base por categoría, los conteos se calcularon contra los límites de cada grupo:
+    # los límites globales se etiquetan como tales y se añaden los de cada categoría
+    digest["columns"] = columns.rename(columns={
+        "Límite inf.": "Límite inf. (global)", "Límite sup.": "Límite sup. (global)",
+        "Mediana": "Mediana (global)", "MAD": "MAD (global)",
+    }).round(4).to_dict(orient="records")
+    fences = result["group_fences"]
+    fences = fences[fences["Columna"].isin(columns["Columna"])].round(4)
+    digest["group_fences"] = {
+        str(col): g.drop(columns="Columna").assign(Categoría=g["Categoría"].astype(str)).to_dict(orient="records")
+        for col, g in fences.groupby("Columna", sort=False)
+    }
+    return digest
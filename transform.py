@@ -0,0 +1,522 @@
+import io
+import json
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import pandas as pd
+import numpy as np
+from pandas.tseries.api import guess_datetime_format
+
+DATE_KEYWORDS = ["date", "fecha", "time", "dia", "mes", "año"]
+DATE_PARTS = ["year", "month", "day", "weekday"]
+# Tipos compactos de las columnas derivadas (nullable para admitir NaT)
+DATE_PART_DTYPES = {"year": "Int16", "month": "Int8", "day": "Int8"}
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Bytes por fila de cada columna derivada (datos + máscara de nulos)
+DATE_PART_BYTES = {"year": 3, "month": 2, "day": 2, "weekday": 1}
+# Bytes por fila de la etapa de duplicados (hashes, orden, hashes ordenados, máscaras)
+ROW_MASK_BYTES = 26
+# Lote mínimo del modo por lotes: por debajo el coste por lote domina sin ahorrar memoria
+MIN_CHUNK_ROWS = 20_000
+
+
+def _detect_date_format(s: pd.Series, sample_size: int = 200) -> str | None:
+    """Elige, entre los formatos candidatos del primer valor, el que parsea más filas de una muestra."""
+    sample = s.head(sample_size * 50).dropna().astype(str).head(sample_size)
+    if len(sample) == 0:
+        return None
+    candidates = {guess_datetime_format(sample.iloc[0], dayfirst=dayfirst) for dayfirst in (False, True)}
+    candidates.discard(None)
+    best, best_ok = None, 0
+    for fmt in sorted(candidates):
+        ok = pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+        if ok > best_ok:
+            best, best_ok = fmt, ok
+    return best
+
+
+def _allocate_like(s: pd.Series, n: int):
+    """Arreglo de longitud ``n`` con el dtype de ``s`` para preasignar el resultado por lotes."""
+    if isinstance(s.dtype, np.dtype):
+        return np.empty(n, dtype=s.dtype)
+    return s.array.take(np.full(n, -1), allow_fill=True)
+
+
+def _column_values(s: pd.Series, keep: np.ndarray | None = None):
+    """Valores de ``s`` filtrados por ``keep``, como ndarray si el dtype es de NumPy."""
+    values = s.to_numpy() if isinstance(s.dtype, np.dtype) else s.array
+    return values if keep is None else values[keep]
+
+
+class SeenHashes:
+    """Conjunto incremental de hashes de fila (``uint64``) para deduplicar entre lotes.
+
+    Se guardan varios niveles ordenados de tamaño decreciente que se fusionan al
+    crecer (como un LSM), así cada lote cuesta ~O(lote · log n) y 8 bytes por fila.
+    """
+
+    def __init__(self):
+        self._levels = []
+
+    def __len__(self) -> int:
+        return sum(len(level) for level in self._levels)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        # Buscar claves ordenadas hace que searchsorted recorra cada nivel de forma secuencial
+        order = np.argsort(hashes, kind="stable")
+        keys = hashes[order]
+        found_sorted = np.zeros(len(keys), dtype=bool)
+        for level in self._levels:
+            pos = np.minimum(np.searchsorted(level, keys), len(level) - 1)
+            found_sorted |= level[pos] == keys
+        found = np.empty(len(hashes), dtype=bool)
+        found[order] = found_sorted
+        return found
+
+    @staticmethod
+    def _sorted_unique(values: np.ndarray) -> np.ndarray:
+        # Timsort ("stable") aprovecha los tramos ya ordenados de cada nivel al fusionar
+        values = np.sort(values, kind="stable")
+        if len(values) > 1:
+            values = values[np.concatenate(([True], values[1:] != values[:-1]))]
+        return values
+
+    def add(self, hashes: np.ndarray):
+        new = self._sorted_unique(hashes)
+        while self._levels and len(self._levels[-1]) <= len(new):
+            new = self._sorted_unique(np.concatenate((self._levels.pop(), new)))
+        if len(new):
+            self._levels.append(new)
+
+
+def _exact_duplicates(df: pd.DataFrame, hashes: np.ndarray, chunksize: int) -> np.ndarray:
+    """Equivale a ``df.duplicated()`` usando los hashes de fila solo para preseleccionar.
+
+    El hash de columnas object mezcladas confunde, p. ej., 1 y "1", así que las filas con
+    hash repetido se confirman con ``duplicated()`` en tramos de ``chunksize`` filas.
+    """
+    dup = np.zeros(len(df), dtype=bool)
+    # Ordenar agrupa los hashes iguales conservando el orden original dentro de cada grupo
+    order = np.argsort(hashes, kind="stable")
+    sorted_hashes = hashes[order]
+    same = sorted_hashes[1:] == sorted_hashes[:-1]
+    del sorted_hashes
+    repeated = np.zeros(len(order), dtype=bool)
+    repeated[1:] |= same
+    repeated[:-1] |= same
+    candidates = order[repeated]
+    del order, same, repeated
+
+    # Las primeras apariciones distintas del grupo que cruza el corte pasan al tramo siguiente
+    carry = candidates[:0]
+    for i in range(0, len(candidates), chunksize):
+        block = np.concatenate((carry, candidates[i:i + chunksize]))
+        block_dup = df.iloc[block].duplicated().to_numpy()
+        dup[block[len(carry):]] = block_dup[len(carry):]
+        carry = block[(hashes[block] == hashes[block[-1]]) & ~block_dup]
+    return dup
+
+
+@contextmanager
+def _track_peak(result: dict):
+    """Mide con tracemalloc el pico de memoria asignado dentro del bloque (``result["peak"]``, bytes).
+
+    Si tracemalloc ya estaba activo no se reinicia el pico del llamador, así que la medida
+    es una cota superior.
+    """
+    started = not tracemalloc.is_tracing()
+    if started:
+        tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    try:
+        yield result
+    finally:
+        result["peak"] = max(tracemalloc.get_traced_memory()[1] - baseline, 0)
+        if started:
+            tracemalloc.stop()
+
+
+def _to_builtin(value):
+    # Los escalares de NumPy no son serializables en JSON
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class EtlTransform:
+    """Transformación ETL ajustada y serializable.
+
+    Guarda todo lo que ``run_etl`` aprende de un dataset (valores de imputación,
+    formatos de fecha, min/max del escalado y columnas derivadas) para aplicarlo
+    a lotes nuevos sin volver a ajustar.
+    """
+
+    VERSION = 2
+
+    def __init__(self, drop_duplicates: bool = True, fill_strategy: str = "Mediana/Moda",
+                 normalize: bool = False, memory_budget_mb: float | None = None,
+                 chunksize: int = 100_000):
+        self.drop_duplicates = drop_duplicates
+        self.fill_strategy = fill_strategy
+        self.normalize = normalize
+        self.memory_budget_mb = memory_budget_mb
+        self.chunksize = chunksize
+        self.fill_values = {}
+        self.date_formats = {}
+        self.scaler_min = {}
+        self.scaler_max = {}
+        self.derived = []
+        self.schema = {}
+        self.stats = {}
+
+    # ── Ajuste
+    def _row_mask(self, df: pd.DataFrame, stats: dict, chunksize: int,
+                  seen_hashes: SeenHashes | None = None) -> np.ndarray:
+        """Máscara única de filas a conservar (duplicados y, si aplica, filas con nulos).
+
+        Los hashes de fila y los nulos se acumulan por lotes y columna a columna,
+        de modo que ningún paso materializa una copia completa del dataset. Los duplicados
+        se confirman con igualdad exacta; ``seen_hashes`` (solo hashes) descarta además
+        filas ya vistas en lotes anteriores.
+        """
+        n = len(df)
+        hashes = np.empty(n, dtype=np.uint64)
+        for i in range(0, n, chunksize):
+            hashes[i:i + chunksize] = pd.util.hash_pandas_object(df.iloc[i:i + chunksize], index=False).to_numpy()
+        dup = _exact_duplicates(df, hashes, chunksize)
+        if self.drop_duplicates and seen_hashes is not None:
+            dup = dup | seen_hashes.contains(hashes)
+            seen_hashes.add(hashes[~dup])
+        stats["duplicates"] = int(dup.sum())
+        keep = ~dup if self.drop_duplicates else np.ones(n, dtype=bool)
+
+        na_rows = np.zeros(n, dtype=bool)
+        null_counts = {}
+        for j, c in enumerate(df.columns):
+            na = df.iloc[:, j].isna().to_numpy()
+            count = int((na & keep).sum())
+            if count:
+                null_counts[c] = count
+                na_rows |= na
+        stats["null_counts"] = pd.Series(null_counts, dtype="int64")
+
+        before = int(keep.sum())
+        if self.fill_strategy == "Eliminar filas":
+            keep &= ~na_rows
+        stats["rows_dropped_na"] = before - int(keep.sum())
+        return keep
+
+    def _fit(self, df: pd.DataFrame, keep: np.ndarray):
+        """Aprende imputaciones, formatos de fecha, min/max y columnas derivadas columna a columna."""
+        def kept(c):
+            s = df[c]
+            return s if keep.all() else s[keep]
+
+        numeric_cols = df.select_dtypes(include=np.number).columns.tolist()
+        cat_cols = df.select_dtypes(include=["object", "category"]).columns.tolist()
+
+        self.fill_values = {}
+        if self.fill_strategy == "Mediana/Moda":
+            for c in numeric_cols:
+                self.fill_values[c] = kept(c).median()
+            for c in cat_cols:
+                mode = kept(c).mode()
+                self.fill_values[c] = mode[0] if len(mode) > 0 else "Unknown"
+        elif self.fill_strategy == "Media":
+            for c in numeric_cols:
+                self.fill_values[c] = kept(c).mean()
+            for c in cat_cols:
+                self.fill_values[c] = "Unknown"
+        self.fill_values = {c: _to_builtin(v) for c, v in self.fill_values.items() if not pd.isna(v)}
+
+        date_candidates = [c for c in df.select_dtypes("object").columns
+                           if any(kw in str(c).lower() for kw in DATE_KEYWORDS)]
+        self.date_formats = {c: _detect_date_format(df[c]) for c in date_candidates}
+
+        # La imputación (mediana/media) cae dentro del rango, así que min/max se toman directamente
+        self.scaler_min, self.scaler_max = {}, {}
+        if self.normalize:
+            for c in numeric_cols:
+                s = kept(c)
+                mn, mx = s.min(), s.max()
+                if not (pd.isna(mn) or pd.isna(mx)):
+                    self.scaler_min[c], self.scaler_max[c] = float(mn), float(mx)
+
+        date_cols = [c for c in df.columns
+                     if c in self.date_formats or pd.api.types.is_datetime64_dtype(df[c])]
+        for dc in date_cols:
+            # Fechas que ya venían tipadas: en lotes CSV llegarán como texto
+            self.date_formats.setdefault(dc, None)
+        self.derived = [{"source": dc, "part": part, "name": f"{dc}_{part}"}
+                        for dc in date_cols for part in DATE_PARTS]
+
+    def _touched_columns(self, df: pd.DataFrame) -> list:
+        """Columnas que el ETL reasigna; con copy-on-write el resto se comparte con la entrada."""
+        filled = set()
+        if self.fill_strategy != "Eliminar filas":
+            filled = set(self.fill_values) & set(self.stats.get("null_counts", {}).keys())
+        parsed = {c for c in self.date_formats if not pd.api.types.is_datetime64_any_dtype(df[c])}
+        touched = filled | parsed | set(self.scaler_min)
+        return [c for c in df.columns if c in touched]
+
+    def _estimate_bytes(self, df: pd.DataFrame, keep: np.ndarray, rows: int | None = None) -> int:
+        """Estimación (heurística, no medida) del pico de memoria adicional a la entrada.
+
+        Con ``rows=None`` estima el proceso completo en memoria; con ``rows`` estima el
+        proceso por lotes (columnas tocadas y derivadas preasignadas + temporales de un lote).
+        Se usa para elegir el modo antes de ejecutar; el pico real se mide en ``fit_transform``.
+        """
+        n, n_keep = len(df), int(keep.sum())
+        filtering = n_keep < n
+        col_bytes = df.memory_usage(index=False, deep=False) / max(n, 1)
+        touched = self._touched_columns(df)
+        sources = set(touched) | {d["source"] for d in self.derived}
+        touched_row_bytes = 8 * len(touched)
+        derived_row_bytes = sum(DATE_PART_BYTES[d["part"]] for d in self.derived)
+        # Temporales de un paso columna a columna: to_datetime/escalado ≈ 3 arreglos de 8 bytes
+        temp_row_bytes = 24
+        # Índice filtrado del resultado y máscara de filas
+        index_bytes = 8 * n_keep * filtering + n
+        mask_stage = n * ROW_MASK_BYTES
+        if rows is None:
+            filtered = col_bytes.sum() if filtering else 0
+            apply_stage = n_keep * (filtered + touched_row_bytes + derived_row_bytes + temp_row_bytes)
+            return int(max(mask_stage, apply_stage + index_bytes))
+        shared = col_bytes.drop(touched).sum() if filtering else 0
+        chunk = min(rows, n_keep)
+        chunk_row_bytes = col_bytes[list(sources)].sum() + touched_row_bytes + derived_row_bytes + temp_row_bytes
+        # Posiciones de las filas conservadas (int64) además del resultado preasignado
+        apply_stage = n_keep * (shared + touched_row_bytes + derived_row_bytes + 8) + chunk * chunk_row_bytes
+        return int(max(mask_stage, apply_stage + index_bytes))
+
+    def fit_transform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Aprende los parámetros sobre ``df`` y devuelve el dataset limpio.
+
+        Las filas se filtran una sola vez con una máscara y las columnas se reemplazan
+        sin copiar el resto del dataset. Si el pico estimado supera ``memory_budget_mb``
+        se procesan por lotes solo las columnas que cambian. Con presupuesto, el pico real
+        se mide con tracemalloc y es el que decide ``within_budget``.
+        """
+        self.stats = {}
+        budget = self.memory_budget_mb * 1e6 if self.memory_budget_mb else None
+        if budget is None:
+            # Sin presupuesto no se paga el coste de trazar cada asignación
+            df_clean = self._fit_transform(df, budget)
+            self.stats["peak_mb"] = None
+            self.stats["within_budget"] = True
+            return df_clean
+
+        with _track_peak({}) as measured:
+            df_clean = self._fit_transform(df, budget)
+        self.stats["peak_mb"] = measured["peak"] / 1e6
+        self.stats["within_budget"] = measured["peak"] <= budget
+        return df_clean
+
+    def _fit_transform(self, df: pd.DataFrame, budget: float | None) -> pd.DataFrame:
+        self.schema = {c: str(dtype) for c, dtype in df.dtypes.items()}
+        keep = self._row_mask(df, self.stats, self.chunksize)
+        self._fit(df, keep)
+        self.stats["dates_converted"] = [c for c in self.date_formats
+                                         if not pd.api.types.is_datetime64_any_dtype(df[c])]
+
+        peak = self._estimate_bytes(df, keep)
+        rows = max(self.chunksize, MIN_CHUNK_ROWS)
+        if budget is not None and peak > budget:
+            # Reduce el lote hasta cumplir el presupuesto (sin bajar de MIN_CHUNK_ROWS)
+            while rows // 2 >= MIN_CHUNK_ROWS and self._estimate_bytes(df, keep, rows) > budget:
+                rows //= 2
+        chunked_peak = self._estimate_bytes(df, keep, rows)
+
+        if budget is None or peak <= budget or chunked_peak >= peak:
+            df_clean = self._apply(df[keep] if not keep.all() else df.copy(deep=False))
+            self.stats["mode"] = "memoria"
+        else:
+            peak = chunked_peak
+            df_clean = self._apply_chunked(df, keep, rows)
+            self.stats["mode"] = f"por lotes ({rows:,} filas)"
+        self.stats["peak_mb_estimate"] = peak / 1e6
+        return df_clean
+
+    # ── Aplicación
+    def _apply(self, df: pd.DataFrame) -> pd.DataFrame:
+        values = {c: v for c, v in self.fill_values.items() if c in df.columns}
+        # Columnas enteras de un lote con nulos (Int64): la mediana se redondea para mantener el tipo
+        values = {c: round(v) if isinstance(v, float) and pd.api.types.is_integer_dtype(df[c]) else v
+                  for c, v in values.items()}
+        if values and self.fill_strategy != "Eliminar filas":
+            # Una sola imputación por lotes en lugar de un fillna por columna
+            df = df.fillna(values)
+        df = self._parse_dates(df)
+        df = self._scale(df)
+        df = self._derive(df)
+        return df
+
+    def _parse_dates(self, df: pd.DataFrame) -> pd.DataFrame:
+        for c, fmt in self.date_formats.items():
+            if c in df.columns and not pd.api.types.is_datetime64_any_dtype(df[c]):
+                df[c] = pd.to_datetime(df[c], format=fmt, errors="coerce")
+        return df
+
+    def _scale(self, df: pd.DataFrame) -> pd.DataFrame:
+        for c, mn in self.scaler_min.items():
+            if c in df.columns:
+                rng = self.scaler_max[c] - mn
+                # Igual que MinMaxScaler: un rango nulo no se reescala
+                df[c] = (pd.to_numeric(df[c], errors="coerce") - mn) / (rng if rng != 0 else 1.0)
+        return df
+
+    def _derive(self, df: pd.DataFrame) -> pd.DataFrame:
+        new = {}
+        for d in self.derived:
+            if d["source"] not in df.columns:
+                continue
+            s = df[d["source"]].dt
+            if d["part"] == "weekday":
+                codes = s.dayofweek.fillna(-1).to_numpy().astype(np.int8)
+                new[d["name"]] = pd.Categorical.from_codes(codes, categories=WEEKDAYS, ordered=True)
+            else:
+                new[d["name"]] = getattr(s, d["part"]).astype(DATE_PART_DTYPES[d["part"]]).array
+        if not new:
+            return df
+        # Se añaden de una vez para no fragmentar el DataFrame con inserciones sucesivas
+        df = df.drop(columns=[c for c in new if c in df.columns])
+        return pd.concat([df, pd.DataFrame(new, index=df.index)], axis=1)
+
+    def _apply_chunked(self, df: pd.DataFrame, keep: np.ndarray, rows: int) -> pd.DataFrame:
+        """Procesa por lotes solo las columnas tocadas y derivadas; el resto se comparte."""
+        positions = np.flatnonzero(keep)
+        if len(positions) == 0:
+            return self._apply(df.iloc[:0])
+        touched = self._touched_columns(df)
+        derived_sources = {d["source"] for d in self.derived}
+        source_pos = [j for j, c in enumerate(df.columns) if c in touched or c in derived_sources]
+        out = None
+        for start in range(0, len(positions), rows):
+            part = self._apply(df.iloc[positions[start:start + rows], source_pos])
+            written = touched + [d["name"] for d in self.derived if d["name"] in part.columns]
+            if out is None:
+                out = {c: _allocate_like(part[c], len(positions)) for c in written}
+            for c in written:
+                target = out[c]
+                target[start:start + len(part)] = (part[c].to_numpy() if isinstance(target, np.ndarray)
+                                                   else part[c].array)
+
+        # Columnas no tocadas: se filtran columna a columna (tomar un subconjunto de un bloque
+        # consolidado duplicaría el pico) o se comparten tal cual si no se descartan filas
+        filtering = len(positions) < len(df)
+        columns = {c: out[c] if c in out else _column_values(df[c], keep if filtering else None)
+                   for c in df.columns}
+        columns.update({c: v for c, v in out.items() if c not in columns})
+        # Con el dtype explícito pandas 2 no vuelve a inferir (ni copiar) las columnas object
+        index = df.index[keep]
+        return pd.DataFrame({c: pd.Series(v, index=index, dtype=v.dtype, copy=False)
+                             for c, v in columns.items()}, copy=False)
+
+    # ── Esquema ajustado
+    def _text_dtypes(self) -> dict:
+        """Columnas de texto del ajuste, para leerlas como texto sin inferir números (``dtype=``)."""
+        return {c: str for c, dtype in self.schema.items()
+                if dtype in ("object", "str", "string", "category") and c not in self.date_formats}
+
+    def _conform(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Lleva las columnas numéricas y booleanas de un lote al tipo del ajuste.
+
+        Cada lote de ``read_csv`` infiere sus propios tipos (1 en un lote, 1.0 en otro si
+        trae nulos), lo que cambiaría los hashes entre lotes y el formato de salida. Las
+        enteras pasan a ``Int64`` para admitir nulos sin volverse float.
+        """
+        casts = {}
+        for c, name in self.schema.items():
+            if c not in df.columns:
+                continue
+            try:
+                dtype = pd.api.types.pandas_dtype(name)
+            except TypeError:
+                # Tipo de otra versión de pandas: la columna se deja como llegue
+                continue
+            if pd.api.types.is_bool_dtype(dtype):
+                target = "boolean"
+            elif pd.api.types.is_integer_dtype(dtype):
+                target = "Int64"
+            elif pd.api.types.is_float_dtype(dtype):
+                target = "float64"
+            else:
+                continue
+            if str(df[c].dtype) != target:
+                casts[c] = target
+        return df.astype(casts) if casts else df
+
+    def transform(self, df: pd.DataFrame, seen_hashes: SeenHashes | None = None) -> pd.DataFrame:
+        """Aplica la transformación ajustada a un lote nuevo, sin reajustar nada.
+
+        ``seen_hashes`` permite eliminar duplicados entre lotes sucesivos de un mismo archivo.
+        """
+        df = self._conform(df)
+        keep = self._row_mask(df, {}, max(len(df), 1), seen_hashes)
+        return self._apply(df[keep] if not keep.all() else df.copy(deep=False))
+
+    def transform_file(self, source, dest=None, chunksize: int = 50_000) -> dict:
+        """Transforma un archivo CSV/Excel por lotes y escribe el resultado como CSV en ``dest``.
+
+        Devuelve filas leídas, filas escritas, segundos y throughput (filas/segundo).
+        """
+        name = getattr(source, "name", source)
+        if isinstance(name, str) and name.lower().endswith((".xlsx", ".xls")):
+            # Excel no admite lectura por lotes: se lee una vez y se trocea
+            full = pd.read_excel(source, dtype=self._text_dtypes())
+            chunks = (full.iloc[i:i + chunksize] for i in range(0, len(full), chunksize))
+        else:
+            chunks = pd.read_csv(source, chunksize=chunksize, dtype=self._text_dtypes())
+
+        out = dest if dest is not None else io.StringIO()
+        seen_hashes = SeenHashes()
+        rows_in = rows_out = 0
+        start = time.perf_counter()
+        for i, chunk in enumerate(chunks):
+            rows_in += len(chunk)
+            result = self.transform(chunk, seen_hashes)
+            rows_out += len(result)
+            result.to_csv(out, index=False, header=(i == 0), mode="w" if i == 0 else "a")
+        seconds = time.perf_counter() - start
+
+        return {
+            "rows_in": rows_in,
+            "rows_out": rows_out,
+            "seconds": seconds,
+            "rows_per_sec": rows_in / seconds if seconds > 0 else float("inf"),
+            "output": out,
+        }
+
+    # ── Serialización
+    # Mapas indexados por columna: se guardan como pares [nombre, valor] porque JSON
+    # convierte en texto las claves no textuales (p. ej. encabezados numéricos de Excel)
+    COLUMN_MAPS = ("fill_values", "date_formats", "scaler_min", "scaler_max", "schema")
+
+    def to_dict(self) -> dict:
+        data = {
+            "version": self.VERSION,
+            "drop_duplicates": self.drop_duplicates,
+            "fill_strategy": self.fill_strategy,
+            "normalize": self.normalize,
+        }
+        for attr in self.COLUMN_MAPS:
+            data[attr] = [[c, v] for c, v in getattr(self, attr).items()]
+        data["derived"] = self.derived
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "EtlTransform":
+        t = cls(drop_duplicates=data["drop_duplicates"], fill_strategy=data["fill_strategy"],
+                normalize=data["normalize"])
+        for attr in cls.COLUMN_MAPS:
+            # La versión 1 guardaba estos mapas como objetos JSON
+            value = data.get(attr, {})
+            setattr(t, attr, dict(value.items() if isinstance(value, dict) else map(tuple, value)))
+        t.derived = data.get("derived", [])
+        return t
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), ensure_ascii=False, indent=2, default=str)
+
+    @classmethod
+    def from_json(cls, text: str) -> "EtlTransform":
+        return cls.from_dict(json.loads(text))